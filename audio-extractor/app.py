@@ -1,69 +1,281 @@
 import os
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, current_app, request, jsonify, send_file
+from flask.json.provider import JSONProvider
 import ffmpeg
+from werkzeug.exceptions import HTTPException
+from werkzeug.security import safe_join
 from werkzeug.utils import secure_filename
+import io
 import json
+import mimetypes
+import multiprocessing
+import re
 from vosk import Model, KaldiRecognizer
+import shutil
+import threading
+import time
+import unicodedata
 import wave
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from itertools import count
+from tempfile import SpooledTemporaryFile
+from urllib.parse import quote
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 app = Flask(__name__)
 
+# Serialize JSON responses with orjson when it's installed
+if orjson is not None:
+    class OrjsonProvider(JSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = OrjsonProvider(app)
+
 # Config
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['VIDEOS_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'videos')
 app.config['AUDIO_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'audio')
 app.config['TRANSCRIPTIONS_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'transcriptions')
 app.config['MASTER_TRANSCRIPT'] = os.path.join(app.config['UPLOAD_FOLDER'], 'master_transcript.txt')
-app.config['ALLOWED_EXTENSIONS'] = {'mp4', 'avi', 'mov', 'mkv', 'mp3', 'wav'}
+app.config['ALLOWED_EXTENSIONS'] = frozenset({'mp4', 'avi', 'mov', 'mkv', 'mp3', 'wav'})
 app.config['MAX_CONTENT_LENGTH'] = 500 * 1024 * 1024  # 500MB limit
 app.config['VOSK_MODEL_PATH'] = 'models/vosk-model-small-en-us-0.15'
+# Let nginx serve downloads via X-Accel-Redirect; needs an internal location such as
+#   location /_protected/ { internal; alias /abs/path/to/uploads/; }
+app.config['USE_X_ACCEL_REDIRECT'] = False
+app.config['X_ACCEL_PREFIX'] = '/_protected/'
+app.config['EXPORT_MP3'] = False  # Also produce a downloadable MP3 from the same decode
+
+# Module-level copies of the config used on the request path
+UPLOAD_FOLDER = app.config['UPLOAD_FOLDER']
+VIDEOS_FOLDER = app.config['VIDEOS_FOLDER']
+AUDIO_FOLDER = app.config['AUDIO_FOLDER']
+TRANSCRIPTIONS_FOLDER = app.config['TRANSCRIPTIONS_FOLDER']
+MASTER_TRANSCRIPT = app.config['MASTER_TRANSCRIPT']
+ALLOWED_EXTENSIONS = app.config['ALLOWED_EXTENSIONS']
+VOSK_MODEL_PATH = app.config['VOSK_MODEL_PATH']
 
 # Ensure upload directories exist
-os.makedirs(app.config['VIDEOS_FOLDER'], exist_ok=True)
-os.makedirs(app.config['AUDIO_FOLDER'], exist_ok=True)
-os.makedirs(app.config['TRANSCRIPTIONS_FOLDER'], exist_ok=True)
+os.makedirs(VIDEOS_FOLDER, exist_ok=True)
+os.makedirs(AUDIO_FOLDER, exist_ok=True)
+os.makedirs(TRANSCRIPTIONS_FOLDER, exist_ok=True)
+
+# Feed Vosk 2 seconds of 16 kHz 16-bit mono PCM per call
+PCM_CHUNK_BYTES = 32000 * 2
+
+# Audio longer than this is split into segments that are transcribed in parallel
+LONG_AUDIO_SECONDS = 120
+SEGMENT_SECONDS = 30
+# Overlap at cuts that don't fall in a silence, and how many repeated words to look for there
+SEGMENT_OVERLAP_SECONDS = 0.5
+SEAM_MAX_WORDS = 3
+
+# How long a finished job's status stays available for polling
+JOB_TTL_SECONDS = 3600
+
+# Upload filenames are made unique by the process start time (in microseconds) and a counter
+_FILENAME_EPOCH = time.time_ns() // 1000
+_filename_counter = count()
+
+# Vosk model is loaded once per process and shared by all recognizers
+VOSK_MODEL = None
+_vosk_model_lock = threading.Lock()
+
+# Master transcript stays open for appending instead of being reopened per entry
+master_transcript = open(MASTER_TRANSCRIPT, 'a', buffering=1 << 16, encoding='utf-8')
+master_transcript_lock = threading.Lock()
+
+def get_vosk_model():
+    """Return the process-wide Vosk model, loading it on first use"""
+    global VOSK_MODEL
+    if VOSK_MODEL is None:
+        with _vosk_model_lock:
+            if VOSK_MODEL is None:
+                if not os.path.exists(VOSK_MODEL_PATH):
+                    raise ValueError(f"Could not find Vosk model at {VOSK_MODEL_PATH}")
+                VOSK_MODEL = Model(VOSK_MODEL_PATH)
+    return VOSK_MODEL
 
 def allowed_file(filename):
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
-
-def convert_to_wav(input_path, output_path):
-    """Convert any audio file to Vosk-compatible WAV format"""
-    (
-        ffmpeg.input(input_path)
-        .output(output_path, acodec='pcm_s16le', ac=1, ar='16000')
+    _, dot, ext = filename.rpartition('.')
+    return bool(dot) and ext.lower() in ALLOWED_EXTENSIONS
+
+def probe_audio(input_path):
+    """Return ffprobe's description of the input's first audio stream and its duration"""
+    probe = ffmpeg.probe(input_path, select_streams='a:0')
+    if not probe.get('streams'):
+        raise ValueError("File has no audio stream")
+    audio_stream = probe['streams'][0]
+    # The audio track can end before the video, so prefer its own duration;
+    # some containers (e.g. MKV) only report one for the whole file
+    duration = audio_stream.get('duration') or probe['format'].get('duration', 0)
+    return audio_stream, float(duration)
+
+def is_vosk_pcm(audio_stream):
+    """Check whether a probed audio stream is already 16 kHz mono 16-bit PCM"""
+    return audio_stream.get('codec_name') == 'pcm_s16le' and \
+           audio_stream.get('channels') == 1 and \
+           audio_stream.get('sample_rate') == '16000'
+
+def mp3_output(stream, mp3_path, audio_stream):
+    """Build the user-facing MP3 output from the probed audio stream of an opened input"""
+    # MP3 sources only need demuxing, not a decode and re-encode
+    if audio_stream.get('codec_name') == 'mp3':
+        return stream.output(mp3_path, vn=None, acodec='copy')
+    return stream.output(mp3_path, vn=None, acodec='libmp3lame', audio_bitrate='192k', threads=0)
+
+def start_audio_extraction(input_path, wav_path, audio_stream, mp3_path=None):
+    """Decode the input once, writing the WAV (and optional MP3) downloads and piping raw PCM for Vosk"""
+    # Audio that is already in Vosk's format only needs demuxing, not re-encoding
+    if is_vosk_pcm(audio_stream):
+        audio_args = {'acodec': 'copy'}
+    else:
+        audio_args = {'acodec': 'pcm_s16le', 'ac': 1, 'ar': '16000'}
+
+    # Map the probed audio stream explicitly; ffmpeg would otherwise pick the one with the most channels
+    stream = ffmpeg.input(input_path)['a:0']
+    # -vn keeps ffmpeg from decoding video we'd only throw away
+    wav_out = stream.output(wav_path, vn=None, threads=0, **audio_args)
+    pcm_out = stream.output('pipe:', vn=None, format='s16le', threads=0, **audio_args)
+    outputs = [wav_out, pcm_out]
+    if mp3_path:
+        outputs.append(mp3_output(stream, mp3_path, audio_stream))
+    return (
+        ffmpeg.merge_outputs(*outputs)
+        .global_args('-nostats', '-loglevel', 'error')
         .overwrite_output()
-        .run(quiet=True)
+        .run_async(pipe_stdout=True, pipe_stderr=True)
     )
 
-def transcribe_audio(audio_path):
-    if not os.path.exists(app.config['VOSK_MODEL_PATH']):
-        raise ValueError(f"Could not find Vosk model at {app.config['VOSK_MODEL_PATH']}")
+def extract_wav_with_silences(input_path, wav_path, audio_stream, mp3_path=None):
+    """Write the Vosk WAV (and optional MP3) and return the (start, end) silences ffmpeg found along the way"""
+    # Map the probed audio stream explicitly; ffmpeg would otherwise pick the one with the most channels
+    stream = ffmpeg.input(input_path)['a:0']
+    outputs = [stream.output(wav_path, vn=None, acodec='pcm_s16le', ac=1, ar='16000', threads=0,
+                             af='silencedetect=n=-30dB:d=0.3')]
+    if mp3_path:
+        outputs.append(mp3_output(stream, mp3_path, audio_stream))
+    _, stderr = (
+        ffmpeg.merge_outputs(*outputs)
+        .global_args('-nostats')
+        .overwrite_output()
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    log = stderr.decode('utf-8', 'replace')
+    starts = [float(t) for t in re.findall(r'silence_start: (-?[\d.]+)', log)]
+    ends = [float(t) for t in re.findall(r'silence_end: ([\d.]+)', log)]
+    return list(zip(starts, ends))
+
+def plan_segments(duration, silences):
+    """Split the audio into ~SEGMENT_SECONDS (start, end) frame ranges, cutting in silences where possible"""
+    midpoints = [(start + end) / 2 for start, end in silences]
+    cuts = []  # (seconds, is_hard_cut)
+    position = 0.0
+    while duration - position > SEGMENT_SECONDS * 1.5:
+        target = position + SEGMENT_SECONDS
+        # Prefer the silence nearest the target, falling back to a hard cut
+        nearby = [m for m in midpoints if abs(m - target) <= SEGMENT_SECONDS / 3]
+        if nearby:
+            position = min(nearby, key=lambda m: abs(m - target))
+            cuts.append((position, False))
+        else:
+            position = target
+            cuts.append((position, True))
+
+    # Hard cuts may land mid-word, so neighbouring segments overlap there and
+    # stitch_segments drops the words both sides heard
+    half_overlap = SEGMENT_OVERLAP_SECONDS / 2
+    starts = [0.0] + [cut - half_overlap if hard else cut for cut, hard in cuts]
+    ends = [cut + half_overlap if hard else cut for cut, hard in cuts]
+
+    # The last segment runs to the end of the WAV rather than trusting the probed duration
+    return [(int(start * 16000), int(end * 16000)) for start, end in zip(starts, ends)] + \
+           [(int(starts[-1] * 16000), None)]
+
+def stitch_segments(segments, texts):
+    """Join segment transcripts in order, de-duplicating words repeated across overlapping seams"""
+    words = []
+    for i, text in enumerate(texts):
+        new_words = text.split()
+        if i > 0 and segments[i][0] < segments[i - 1][1]:
+            # Drop the longest run of new words that repeats the tail of the previous segment
+            for n in range(min(len(words), len(new_words), SEAM_MAX_WORDS), 0, -1):
+                if words[-n:] == new_words[:n]:
+                    new_words = new_words[n:]
+                    break
+        words.extend(new_words)
+    return " ".join(words)
+
+def recognize_pcm(read_chunk):
+    """Run a fresh recognizer over 16 kHz mono PCM from read_chunk() until it returns nothing"""
+    rec = KaldiRecognizer(get_vosk_model(), 16000)
+
+    results = []
+    while True:
+        data = read_chunk()
+        if len(data) == 0:
+            break
+        if rec.AcceptWaveform(data):
+            results.append(rec.Result())
     
-    model = Model(app.config['VOSK_MODEL_PATH'])
-    rec = KaldiRecognizer(model, 16000)
-    rec.SetWords(True)
+    results.append(rec.FinalResult())
+
+    results = [json.loads(result) for result in results]
+    return " ".join([result['text'] for result in results if 'text' in result]).strip()
+
+def transcribe_audio(proc):
+    """Transcribe the 16 kHz mono PCM stream produced by start_audio_extraction"""
+    # Drain stderr alongside stdout so a chatty ffmpeg can't fill the pipe and stall
+    stderr_chunks = []
+    stderr_reader = threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True)
+    stderr_reader.start()
 
     try:
-        wf = wave.open(audio_path, "rb")
-        if wf.getnchannels() != 1 or wf.getsampwidth() != 2 or wf.getcomptype() != "NONE":
-            raise ValueError("Audio file must be WAV format mono PCM")
-        
-        results = []
-        while True:
-            data = wf.readframes(4000)
-            if len(data) == 0:
-                break
-            if rec.AcceptWaveform(data):
-                part_result = json.loads(rec.Result())
-                results.append(part_result)
-        
-        final_result = json.loads(rec.FinalResult())
-        results.append(final_result)
-        
-        return " ".join([result['text'] for result in results if 'text' in result]).strip()
+        transcription = recognize_pcm(lambda: proc.stdout.read(PCM_CHUNK_BYTES))
     
+    except Exception as e:
+        proc.kill()
+        raise Exception(f"Transcription failed: {str(e)}")
+    
+    finally:
+        proc.wait()
+        stderr_reader.join()
+
+    if proc.returncode != 0:
+        raise ffmpeg.Error('ffmpeg', None, b''.join(stderr_chunks))
+
+    return transcription
+
+def transcribe_segment(audio_path, start, end):
+    """Transcribe frames [start, end) of a Vosk WAV; end=None reads to the end of the file"""
+    try:
+        with wave.open(audio_path, "rb") as wf:
+            # Clamp to the WAV so a plan that overshoots just yields an empty segment
+            nframes = wf.getnframes()
+            start = min(start, nframes)
+            end = nframes if end is None else min(end, nframes)
+            wf.setpos(start)
+            remaining = max(end - start, 0)
+
+            def read_chunk():
+                nonlocal remaining
+                frames = min(remaining, PCM_CHUNK_BYTES // 2)
+                remaining -= frames
+                return wf.readframes(frames)
+
+            return recognize_pcm(read_chunk)
+
     except Exception as e:
         raise Exception(f"Transcription failed: {str(e)}")
 
@@ -72,20 +284,185 @@ def save_to_master_transcript(filename, transcription):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     entry = f"\n\n--- {filename} ({timestamp}) ---\n{transcription}"
     
-    with open(app.config['MASTER_TRANSCRIPT'], 'a', encoding='utf-8') as f:
-        f.write(entry)
-
-def get_unique_filename(base_name, extension, folder):
-    """Generate a unique filename by appending a number if needed"""
-    counter = 1
-    name, ext = os.path.splitext(base_name)
-    new_filename = f"{name}{extension}"
-    
-    while os.path.exists(os.path.join(folder, new_filename)):
-        new_filename = f"{name}_{counter}{extension}"
-        counter += 1
+    with master_transcript_lock:
+        master_transcript.write(entry)
+        master_transcript.flush()
+
+def _init_worker():
+    """Load the Vosk model once in each worker process"""
+    if os.path.exists(VOSK_MODEL_PATH):
+        get_vosk_model()
+
+def _new_executor():
+    """Start a process pool for CPU-bound extraction and transcription"""
+    # ffmpeg is multi-threaded too, so leave it half the cores. Workers are spawned, not
+    # forked: the pool grows from job threads while request threads are running, and
+    # forking a multi-threaded process can deadlock the child.
+    return ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) // 2),
+                               mp_context=multiprocessing.get_context('spawn'),
+                               initializer=_init_worker)
+
+# Transcription is CPU-bound, so it runs in worker processes off the request thread
+executor = _new_executor()
+executor_lock = threading.Lock()
+
+def _submit_work(fn, *args):
+    """Submit work to the process pool, replacing the pool if a dead worker broke it"""
+    global executor
+    pool = executor
+    try:
+        return pool.submit(fn, *args)
+    except BrokenProcessPool:
+        with executor_lock:
+            if executor is pool:
+                executor = _new_executor()
+                pool.shutdown(wait=False)
+        return executor.submit(fn, *args)
+
+# Threads that wait on the worker processes and record each job's outcome
+job_runner = ThreadPoolExecutor(thread_name_prefix='job')
+
+# Job status keyed by job id; finished jobs are dropped JOB_TTL_SECONDS after they finish
+jobs = {}
+jobs_finished_at = {}
+jobs_lock = threading.Lock()
+
+def _prune_jobs():
+    """Forget finished jobs past their TTL; call with jobs_lock held"""
+    cutoff = time.monotonic() - JOB_TTL_SECONDS
+    for job_id in [job_id for job_id, finished in jobs_finished_at.items() if finished < cutoff]:
+        del jobs[job_id]
+        del jobs_finished_at[job_id]
+
+def _transcribe_job(video_path, audio_path, mp3_path=None):
+    """Extract a saved upload's audio inside a worker process, transcribing it unless it is long"""
+    try:
+        audio_stream, duration = probe_audio(video_path)
+
+        # Long audio: write the WAV and find silences in one pass so the caller can
+        # transcribe segments in parallel
+        if duration > LONG_AUDIO_SECONDS:
+            silences = extract_wav_with_silences(video_path, audio_path, audio_stream, mp3_path)
+
+            # Plan from the audio actually written, not the probed estimate
+            with wave.open(audio_path, "rb") as wf:
+                wav_duration = wf.getnframes() / wf.getframerate()
+            return {'status': 'segmented', 'segments': plan_segments(wav_duration, silences)}
+
+        # Extract the audio once: WAV (and MP3) for download, raw PCM piped to Vosk
+        proc = start_audio_extraction(video_path, audio_path, audio_stream, mp3_path)
+
+        # Transcribe the audio as ffmpeg decodes it
+        return {'status': 'success', 'transcription': transcribe_audio(proc)}
+
+    # ffmpeg.Error can't be pickled back to the parent, so report errors as data
+    except ffmpeg.Error as e:
+        return {'status': 'error', 'error': 'FFmpeg processing failed', 'details': str(e)}
+    except Exception as e:
+        return {'status': 'error', 'error': 'Server error', 'details': str(e)}
+
+def _run_job(job_id, video_filename, audio_filename, transcription_filename, export_mp3=False):
+    """Drive one upload through the worker processes and record its outcome"""
+    video_path = os.path.join(VIDEOS_FOLDER, video_filename)
+    audio_path = os.path.join(AUDIO_FOLDER, audio_filename)
+    transcription_path = os.path.join(TRANSCRIPTIONS_FOLDER, transcription_filename)
+    mp3_filename = os.path.splitext(audio_filename)[0] + '.mp3' if export_mp3 else None
+    mp3_path = os.path.join(AUDIO_FOLDER, mp3_filename) if mp3_filename else None
+
+    try:
+        result = _submit_work(_transcribe_job, video_path, audio_path, mp3_path).result()
+
+        if result['status'] == 'segmented':
+            # Transcribe every segment in parallel and stitch them back in order
+            segments = result['segments']
+            futures = [_submit_work(transcribe_segment, audio_path, start, end)
+                       for start, end in segments]
+            transcription = stitch_segments(segments, [future.result() for future in futures])
+            result = {'status': 'success', 'transcription': transcription}
+
+        if result['status'] == 'success':
+            transcription = result.pop('transcription')
+
+            # Save individual transcription
+            with open(transcription_path, 'w', encoding='utf-8') as f:
+                f.write(transcription)
+
+            # Append to master transcript
+            save_to_master_transcript(video_filename, transcription)
+
+            result.update({
+                'video_url': f'/api/videos/{video_filename}',
+                'audio_url': f'/api/download/{audio_filename}',
+                'transcription_url': f'/api/download-transcription/{transcription_filename}',
+                'master_transcript_url': '/api/download-master-transcript',
+                'transcription_preview': transcription[:200] + '...' if len(transcription) > 200 else transcription,
+                'video_filename': video_filename,
+                'audio_filename': audio_filename,
+                'transcription_filename': transcription_filename
+            })
+            if mp3_filename:
+                result['mp3_url'] = f'/api/download/{mp3_filename}'
+                result['mp3_filename'] = mp3_filename
+    except BrokenProcessPool as e:
+        # The pool is replaced on the next submit
+        result = {'status': 'error', 'error': 'Worker process crashed', 'details': str(e)}
+    except Exception as e:
+        result = {'status': 'error', 'error': 'Server error', 'details': str(e)}
+
+    with jobs_lock:
+        jobs[job_id] = result
+        jobs_finished_at[job_id] = time.monotonic()
+
+def save_upload(file, path):
+    """Save an uploaded file, letting the kernel do the copy when Werkzeug spooled it to disk"""
+    # Only use sendfile for streams already on disk; fileno() on an in-memory
+    # SpooledTemporaryFile would force it to roll over first
+    stream = file.stream
+    if isinstance(stream, SpooledTemporaryFile):
+        on_disk = stream._rolled
+    else:
+        on_disk = isinstance(stream, io.BufferedRandom)
+
+    if not on_disk or not hasattr(os, 'sendfile'):
+        file.save(path)
+        return
+
+    src_fd = stream.fileno()
+
+    size = os.fstat(src_fd).st_size
+    with open(path, 'wb') as dst:
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(dst.fileno(), src_fd, offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+
+def _job_filenames(custom_name):
+    """Build the video, audio and transcription filenames for a new upload"""
+    # Process start time plus a per-process counter: sortable and unique without polling the disk
+    base_name = f"{custom_name}_{_FILENAME_EPOCH}_{next(_filename_counter)}"
     
-    return new_filename
+    video_filename = f"{base_name}.mp4"
+    audio_filename = f"{base_name}.wav"
+    transcription_filename = f"{base_name}.txt"
+    return video_filename, audio_filename, transcription_filename
+
+def _submit_job(video_filename, audio_filename, transcription_filename):
+    """Queue a saved video for extraction and transcription, returning its pending status"""
+    job_id = uuid.uuid4().hex
+    with jobs_lock:
+        _prune_jobs()
+        jobs[job_id] = {'status': 'pending'}
+    # Job threads run outside the app context, so read per-job settings here
+    job_runner.submit(_run_job, job_id, video_filename, audio_filename, transcription_filename,
+                      current_app.config['EXPORT_MP3'])
+
+    return {
+        'status': 'pending',
+        'job_id': job_id,
+        'job_url': f'/api/jobs/{job_id}'
+    }
 
 @app.route('/api/extract-audio', methods=['POST'])
 def extract_audio():
@@ -105,68 +482,150 @@ def extract_audio():
         if not custom_name:
             custom_name = os.path.splitext(secure_filename(file.filename))[0]
         
-        # Generate unique filenames with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        base_name = f"{custom_name}_{timestamp}"
-        
-        # Get unique filenames if duplicates exist
-        video_filename = get_unique_filename(base_name, '.mp4', app.config['VIDEOS_FOLDER'])
-        audio_filename = get_unique_filename(base_name, '.wav', app.config['AUDIO_FOLDER'])
-        transcription_filename = get_unique_filename(base_name, '.txt', app.config['TRANSCRIPTIONS_FOLDER'])
-        
-        video_path = os.path.join(app.config['VIDEOS_FOLDER'], video_filename)
-        audio_path = os.path.join(app.config['AUDIO_FOLDER'], audio_filename)
-        transcription_path = os.path.join(app.config['TRANSCRIPTIONS_FOLDER'], transcription_filename)
+        filenames = _job_filenames(custom_name)
 
         # Save video file
-        file.save(video_path)
+        save_upload(file, os.path.join(VIDEOS_FOLDER, filenames[0]))
 
-        # Extract and convert audio to Vosk-compatible WAV
-        convert_to_wav(video_path, audio_path)
+        return jsonify(_submit_job(*filenames)), 202
 
-        # Automatically transcribe the audio
-        transcription = transcribe_audio(audio_path)
-        
-        # Save individual transcription
-        with open(transcription_path, 'w', encoding='utf-8') as f:
-            f.write(transcription)
-        
-        # Append to master transcript
-        save_to_master_transcript(video_filename, transcription)
+    except Exception as e:
+        return jsonify({'error': 'Server error', 'details': str(e)}), 500
+
+@app.route('/api/extract-audio-stream', methods=['POST'])
+def extract_audio_stream():
+    """Accept the raw video as the request body, bypassing the multipart parser"""
+    custom_name = secure_filename(request.args.get('name') or request.headers.get('X-File-Name', ''))
+    ext = (request.args.get('ext') or request.headers.get('X-File-Ext', '')).lstrip('.').lower()
+
+    if not custom_name:
+        return jsonify({'error': 'No file name given'}), 400
+
+    if ext not in ALLOWED_EXTENSIONS:
+        return jsonify({'error': 'Invalid file type'}), 400
+
+    # Reject oversized bodies before anything is written to disk
+    if request.content_length is not None and request.max_content_length is not None and \
+            request.content_length > request.max_content_length:
+        return jsonify({'error': 'File too large'}), 413
+
+    try:
+        filenames = _job_filenames(custom_name)
+        video_path = os.path.join(VIDEOS_FOLDER, filenames[0])
+
+        # Copy the body to disk in 1 MB chunks, dropping the partial file if the
+        # body runs over the limit or the client disconnects
+        try:
+            with open(video_path, 'wb') as f:
+                shutil.copyfileobj(request.stream, f, length=1 << 20)
+        except BaseException:
+            if os.path.exists(video_path):
+                os.remove(video_path)
+            raise
+
+        if os.path.getsize(video_path) == 0:
+            os.remove(video_path)
+            return jsonify({'error': 'No file uploaded'}), 400
+
+        return jsonify(_submit_job(*filenames)), 202
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        return jsonify({'error': 'Server error', 'details': str(e)}), 500
+
+@app.route('/api/extract-audio-batch', methods=['POST'])
+def extract_audio_batch():
+    """Accept several files at once and transcribe them in parallel, one job per file"""
+    files = [file for file in request.files.getlist('file') if file.filename != '']
+    if not files:
+        return jsonify({'error': 'No file uploaded'}), 400
+
+    invalid = [file.filename for file in files if not allowed_file(file.filename)]
+    if invalid:
+        return jsonify({'error': 'Invalid file type', 'details': invalid}), 400
+
+    try:
+        # Save every video first, then queue them so they fan out across the worker pool
+        batch = []
+        for file in files:
+            filenames = _job_filenames(os.path.splitext(secure_filename(file.filename))[0])
+            save_upload(file, os.path.join(VIDEOS_FOLDER, filenames[0]))
+            batch.append(filenames)
 
         return jsonify({
-            'status': 'success',
-            'video_url': f'/api/videos/{video_filename}',
-            'audio_url': f'/api/download/{audio_filename}',
-            'transcription_url': f'/api/download-transcription/{transcription_filename}',
-            'master_transcript_url': '/api/download-master-transcript',
-            'transcription_preview': transcription[:200] + '...' if len(transcription) > 200 else transcription,
-            'video_filename': video_filename,
-            'audio_filename': audio_filename,
-            'transcription_filename': transcription_filename
-        })
+            'status': 'pending',
+            'jobs': [_submit_job(*filenames) for filenames in batch]
+        }), 202
 
-    except ffmpeg.Error as e:
-        return jsonify({'error': 'FFmpeg processing failed', 'details': str(e)}), 500
     except Exception as e:
         return jsonify({'error': 'Server error', 'details': str(e)}), 500
 
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    with jobs_lock:
+        job = jobs.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        return jsonify(dict(job, job_id=job_id))
+
+def content_disposition(filename):
+    """Build an attachment header with an ASCII fallback and an RFC 5987 UTF-8 filename"""
+    fallback = unicodedata.normalize('NFKD', filename).encode('ascii', 'ignore').decode('ascii')
+    fallback = fallback.replace('\\', '').replace('"', '')
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+def send_upload(folder, filename, as_attachment=True, max_age=3600):
+    """Send a file from an uploads folder, handing the transfer to nginx when configured"""
+    # safe_join rejects names that would escape the folder (e.g. '..' or '..\\x' on Windows)
+    path = safe_join(folder, filename)
+    if path is None or not os.path.isfile(path):
+        raise FileNotFoundError(filename)
+
+    if not current_app.config['USE_X_ACCEL_REDIRECT']:
+        return send_file(path, as_attachment=as_attachment,
+                         conditional=True, etag=True, max_age=max_age)
+
+    relative_path = os.path.relpath(path, UPLOAD_FOLDER).replace(os.sep, '/')
+    response = Response(mimetype=mimetypes.guess_type(path)[0] or 'application/octet-stream')
+    response.headers['X-Accel-Redirect'] = current_app.config['X_ACCEL_PREFIX'] + quote(relative_path)
+    response.cache_control.max_age = max_age
+    if as_attachment:
+        response.headers['Content-Disposition'] = content_disposition(os.path.basename(path))
+    return response
+
 @app.route('/api/download-master-transcript', methods=['GET'])
 def download_master_transcript():
     try:
-        if not os.path.exists(app.config['MASTER_TRANSCRIPT']):
+        if not os.path.exists(MASTER_TRANSCRIPT):
             return jsonify({'error': 'Master transcript not found'}), 404
-        return send_file(app.config['MASTER_TRANSCRIPT'], as_attachment=True)
+        # The master transcript keeps growing, so let clients revalidate via ETag
+        return send_upload(os.path.dirname(MASTER_TRANSCRIPT), os.path.basename(MASTER_TRANSCRIPT),
+                           max_age=0)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/download-transcription/<filename>', methods=['GET'])
 def download_transcription(filename):
     try:
-        transcription_path = os.path.join(app.config['TRANSCRIPTIONS_FOLDER'], filename)
-        return send_file(transcription_path, as_attachment=True)
+        return send_upload(TRANSCRIPTIONS_FOLDER, filename)
     except FileNotFoundError:
         return jsonify({'error': 'Transcription file not found'}), 404
 
+@app.route('/api/download/<filename>', methods=['GET'])
+def download_audio(filename):
+    try:
+        return send_upload(AUDIO_FOLDER, filename)
+    except FileNotFoundError:
+        return jsonify({'error': 'Audio file not found'}), 404
+
+@app.route('/api/videos/<filename>', methods=['GET'])
+def download_video(filename):
+    try:
+        return send_upload(VIDEOS_FOLDER, filename, as_attachment=False)
+    except FileNotFoundError:
+        return jsonify({'error': 'Video file not found'}), 404
+
+# Development server only; use gunicorn.conf.py in production
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', debug=False, threaded=True)
\ No newline at end of file
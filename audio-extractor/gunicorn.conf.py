@@ -0,0 +1,13 @@
+# Run with: gunicorn -c gunicorn.conf.py app:app
+import multiprocessing
+
+bind = '0.0.0.0:5000'
+
+# Job status and the master transcript writer live in the app process, so keep a
+# single worker; CPU-bound transcription already fans out to the app's process pool.
+workers = 1
+worker_class = 'gthread'
+threads = 4 * multiprocessing.cpu_count()
+
+# Large uploads can take a while to arrive
+timeout = 300